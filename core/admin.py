@@ -1,7 +1,11 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
+from django.utils import timezone
+from django.utils.html import format_html_join
+from django.utils.safestring import mark_safe
 
-from core.models import DeliveryRequest, InstallationRequest, User
+from core.models import AddressLocation, Client, DeliveryRequest, InstallationRequest, Job, StatusCode, User
+from core.status_log import request_history, status_events
 
 
 @admin.register(User)
@@ -11,15 +15,61 @@ class CustomUserAdmin(UserAdmin):
     list_filter = UserAdmin.list_filter + ("role",)
 
 
+@admin.register(Client)
+class ClientAdmin(admin.ModelAdmin):
+    list_display = ("name", "phone", "address", "created_at")
+    search_fields = ("=phone_key", "name")
+
+
+class StatusHistoryAdmin(admin.ModelAdmin):
+    readonly_fields = ("status_history",)
+
+    @admin.display(description="История статусов")
+    def status_history(self, obj) -> str:
+        if obj.pk is None:
+            return "—"
+        rows = (
+            (f"{timezone.localtime(row['created_at']):%d.%m.%Y %H:%M}", row["status"])
+            for row in request_history(obj)
+        )
+        return format_html_join(mark_safe("<br>"), "{} — {}", rows) or "—"
+
+    def save_model(self, request, obj, form, change) -> None:
+        with status_events() as log:
+            super().save_model(request, obj, form, change)
+            log.record(obj, actor=request.user)
+
+
 @admin.register(InstallationRequest)
-class InstallationRequestAdmin(admin.ModelAdmin):
+class InstallationRequestAdmin(StatusHistoryAdmin):
     list_display = ("client_name", "scheduled_for", "installer", "manager", "status")
     list_filter = ("status", "installer", "manager")
+    raw_id_fields = ("client",)
     search_fields = ("client_name", "phone", "address")
 
 
 @admin.register(DeliveryRequest)
-class DeliveryRequestAdmin(admin.ModelAdmin):
+class DeliveryRequestAdmin(StatusHistoryAdmin):
     list_display = ("client_name", "scheduled_for", "courier", "manager", "status")
     list_filter = ("status", "courier", "manager")
+    raw_id_fields = ("client",)
     search_fields = ("client_name", "phone", "address")
+
+
+@admin.register(AddressLocation)
+class AddressLocationAdmin(admin.ModelAdmin):
+    list_display = ("address", "latitude", "longitude")
+    search_fields = ("address", "key")
+
+
+@admin.register(StatusCode)
+class StatusCodeAdmin(admin.ModelAdmin):
+    list_display = ("id", "name")
+    search_fields = ("name",)
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ("task", "queue", "status", "attempts", "run_at", "finished_at")
+    list_filter = ("status", "queue", "task")
+    readonly_fields = ("locked_by", "locked_until", "last_error", "created_at", "finished_at")
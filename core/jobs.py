@@ -0,0 +1,151 @@
+import traceback
+from collections import defaultdict
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from typing import Any
+
+from django.db import connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from core.models import Job
+
+DEFAULT_QUEUE = 'default'
+DEFAULT_LEASE = timedelta(minutes=5)
+RETRY_BASE_SECONDS = 10
+
+Handler = Callable[[Any], None]
+
+_handlers: dict[str, tuple[Handler, bool]] = {}
+
+
+def task(name: str, batched: bool = False) -> Callable[[Handler], Handler]:
+    # A batched handler receives the list of payloads of every claimed job of
+    # its task at once, so rollups and indexing can coalesce their writes.
+    def register(handler: Handler) -> Handler:
+        _handlers[name] = (handler, batched)
+        return handler
+    return register
+
+
+def enqueue(name: str, payload: dict | None = None, queue: str = DEFAULT_QUEUE, run_at: datetime | None = None) -> None:
+    job = Job(queue=queue, task=name, payload=payload or {}, run_at=run_at or timezone.now())
+    transaction.on_commit(job.save)
+
+
+def enqueue_many(name: str, payloads: list[dict], queue: str = DEFAULT_QUEUE) -> None:
+    jobs = [Job(queue=queue, task=name, payload=payload) for payload in payloads]
+    transaction.on_commit(lambda: Job.objects.bulk_create(jobs))
+
+
+def _claimable(queue: str, now: datetime):
+    return Job.objects.filter(
+        Q(status=Job.Status.PENDING, run_at__lte=now)
+        | Q(status=Job.Status.RUNNING, locked_until__lt=now, attempts__lt=F('max_attempts')),
+        queue=queue,
+    )
+
+
+def _fail_abandoned(queue: str, now: datetime) -> None:
+    # A job whose worker died (OOM, SIGKILL) on its last attempt never reaches
+    # process(), so it is failed here instead of being re-leased forever.
+    Job.objects.filter(
+        queue=queue,
+        status=Job.Status.RUNNING,
+        locked_until__lt=now,
+        attempts__gte=F('max_attempts'),
+    ).update(
+        status=Job.Status.FAILED,
+        locked_by='',
+        locked_until=None,
+        last_error='Lease expired on the last attempt',
+        finished_at=now,
+    )
+
+
+def claim(worker: str, queue: str = DEFAULT_QUEUE, batch_size: int = 100, lease: timedelta = DEFAULT_LEASE) -> list[Job]:
+    now = timezone.now()
+    locked_until = now + lease
+    _fail_abandoned(queue, now)
+    lease_fields = {
+        'status': Job.Status.RUNNING,
+        'locked_by': worker,
+        'locked_until': locked_until,
+        'attempts': F('attempts') + 1,
+    }
+    candidates = _claimable(queue, now).order_by('run_at')
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic():
+            ids = list(candidates.select_for_update(skip_locked=True).values_list('pk', flat=True)[:batch_size])
+            if not ids:
+                return []
+            Job.objects.filter(pk__in=ids).update(**lease_fields)
+    else:
+        # Without SKIP LOCKED (SQLite) the claim is one UPDATE ... WHERE pk IN
+        # (SELECT ... LIMIT n), so it takes the write lock up front instead of
+        # upgrading a read lock, which concurrent workers would deadlock on.
+        _claimable(queue, now).filter(pk__in=candidates.values('pk')[:batch_size]).update(**lease_fields)
+    return list(
+        Job.objects.filter(
+            queue=queue, status=Job.Status.RUNNING, locked_by=worker, locked_until=locked_until
+        ).order_by('run_at')
+    )
+
+
+def _run(handler: Handler, batched: bool, jobs: list[Job]) -> dict[int, str]:
+    errors = {}
+    if batched:
+        try:
+            with transaction.atomic():
+                handler([job.payload for job in jobs])
+        except Exception:
+            error = traceback.format_exc()
+            errors = {job.pk: error for job in jobs}
+        return errors
+    for job in jobs:
+        try:
+            with transaction.atomic():
+                handler(job.payload)
+        except Exception:
+            errors[job.pk] = traceback.format_exc()
+    return errors
+
+
+def process(jobs: list[Job]) -> tuple[int, int]:
+    if not jobs:
+        return 0, 0
+    grouped: dict[str, list[Job]] = defaultdict(list)
+    for job in jobs:
+        grouped[job.task].append(job)
+    errors: dict[int, str] = {}
+    for name, task_jobs in grouped.items():
+        if name not in _handlers:
+            errors.update({job.pk: f'Unknown task: {name}' for job in task_jobs})
+            continue
+        handler, batched = _handlers[name]
+        errors.update(_run(handler, batched, task_jobs))
+    now = timezone.now()
+    # Jobs whose lease expired mid-run may already belong to another worker.
+    leased = Job.objects.filter(
+        pk__in=[job.pk for job in jobs],
+        locked_by=jobs[0].locked_by,
+        locked_until=jobs[0].locked_until,
+    )
+    done = [job.pk for job in jobs if job.pk not in errors]
+    finished = leased.filter(pk__in=done).update(
+        status=Job.Status.DONE, locked_by='', locked_until=None, last_error='', finished_at=now
+    )
+    still_leased = set(leased.filter(pk__in=list(errors)).values_list('pk', flat=True))
+    failed = [job for job in jobs if job.pk in still_leased]
+    for job in failed:
+        job.last_error = errors[job.pk]
+        job.locked_by = ''
+        job.locked_until = None
+        if job.attempts >= job.max_attempts:
+            job.status = Job.Status.FAILED
+            job.finished_at = now
+        else:
+            job.status = Job.Status.PENDING
+            job.run_at = now + timedelta(seconds=RETRY_BASE_SECONDS * 2 ** (job.attempts - 1))
+    Job.objects.bulk_update(failed, ['status', 'last_error', 'locked_by', 'locked_until', 'run_at', 'finished_at'])
+    return finished, len(failed)
@@ -0,0 +1,56 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from core import jobs
+from core.models import Job
+
+BENCH_QUEUE = 'bench'
+
+
+@jobs.task('bench.noop')
+def noop(payload: dict) -> None:
+    pass
+
+
+@jobs.task('bench.noop_batch', batched=True)
+def noop_batch(payloads: list[dict]) -> None:
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Замер стоимости постановки в очередь и пропускной способности воркера (очередь "bench").'
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument('--jobs', type=int, default=2000)
+        parser.add_argument('--batch-sizes', default='1,10,100')
+
+    def handle(self, *args, **options) -> None:
+        total = options['jobs']
+        Job.objects.filter(queue=BENCH_QUEUE).delete()
+
+        count = min(total, 500)
+        started = time.perf_counter()
+        for index in range(count):
+            with transaction.atomic():
+                jobs.enqueue('bench.noop', {'index': index}, queue=BENCH_QUEUE)
+        elapsed = time.perf_counter() - started
+        self.stdout.write(f'enqueue + commit: {elapsed * 1_000_000 / count:.0f} мкс на задачу')
+        Job.objects.filter(queue=BENCH_QUEUE).delete()
+
+        for task in ('bench.noop', 'bench.noop_batch'):
+            for batch_size in (int(size) for size in options['batch_sizes'].split(',')):
+                Job.objects.bulk_create(
+                    [Job(queue=BENCH_QUEUE, task=task, payload={'index': index}) for index in range(total)],
+                    batch_size=1000,
+                )
+                processed = 0
+                started = time.perf_counter()
+                while claimed := jobs.claim('bench', BENCH_QUEUE, batch_size):
+                    processed += jobs.process(claimed)[0]
+                elapsed = time.perf_counter() - started
+                self.stdout.write(
+                    f'{task}, batch={batch_size}: {processed / elapsed:.0f} задач/с ({processed} за {elapsed:.2f} с)'
+                )
+                Job.objects.filter(queue=BENCH_QUEUE).delete()
@@ -0,0 +1,72 @@
+import time
+import tracemalloc
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.template.loader import render_to_string
+from django.test import RequestFactory
+from django.utils import timezone
+
+from core.models import DeliveryRequest, User
+from core.projections import manager_choices, request_rows
+
+
+class Command(BaseCommand):
+    help = 'Сравнение полных моделей и проекций строк при рендеринге списка заявок (данные откатываются).'
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument('--rows', type=int, default=10_000)
+
+    def _measure(self, build_context) -> tuple[float, int, int]:
+        started = time.perf_counter()
+        html = render_to_string('core/delivery_requests.html', build_context(), request=self.request)
+        elapsed = time.perf_counter() - started
+        tracemalloc.start()
+        render_to_string('core/delivery_requests.html', build_context(), request=self.request)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return elapsed, peak, len(html)
+
+    def handle(self, *args, **options) -> None:
+        with transaction.atomic():
+            owner = User.objects.create(username='bench-owner', role=User.Roles.OWNER)
+            managers = User.objects.bulk_create(
+                [User(username=f'bench-manager-{index}', role=User.Roles.MANAGER) for index in range(20)]
+            )
+            now = timezone.now()
+            DeliveryRequest.objects.bulk_create(
+                [
+                    DeliveryRequest(
+                        client_name=f'Клиент {index}',
+                        phone='+7 900 000-00-00',
+                        address=f'ул. Ленина, д. {index}',
+                        scheduled_for=now + timedelta(minutes=index),
+                        manager=managers[index % len(managers)],
+                    )
+                    for index in range(options['rows'])
+                ],
+                batch_size=1000,
+            )
+            self.request = RequestFactory().get('/requests/deliveries/')
+            self.request.user = owner
+            base = {'filters': {}, 'statuses': []}
+            variants = (
+                ('модели', lambda: {
+                    **base,
+                    'requests': DeliveryRequest.objects.select_related('manager'),
+                    'managers': User.objects.filter(role=User.Roles.MANAGER),
+                }),
+                ('проекции', lambda: {
+                    **base,
+                    'requests': request_rows(DeliveryRequest.objects.all(), owner, 'courier'),
+                    'managers': manager_choices(),
+                }),
+            )
+            self.stdout.write(f'Рендеринг списка доставок, {options["rows"]} строк:')
+            for name, build_context in variants:
+                elapsed, peak, size = self._measure(build_context)
+                self.stdout.write(
+                    f'  {name}: {elapsed * 1000:.0f} мс, пик памяти {peak / 1024 / 1024:.1f} МБ, HTML {size} байт'
+                )
+            transaction.set_rollback(True)
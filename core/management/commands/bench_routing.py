@@ -0,0 +1,26 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.routing import haversine_km, order_points
+
+
+class Command(BaseCommand):
+    help = 'Замер времени построения порядка объезда (ближайший сосед + 2-opt) на случайных точках.'
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument('--stops', default='100,300,500')
+        parser.add_argument('--seed', type=int, default=11)
+
+    def handle(self, *args, **options) -> None:
+        origin = (55.75, 37.6)
+        for count in (int(value) for value in options['stops'].split(',')):
+            rng = random.Random(options['seed'])
+            points = [(55.7 + rng.random() * 0.3, 37.5 + rng.random() * 0.4) for _ in range(count)]
+            started = time.perf_counter()
+            order = order_points(points, origin)
+            elapsed = time.perf_counter() - started
+            path = [origin, *(points[index] for index in order)]
+            length = sum(haversine_km(a, b) for a, b in zip(path, path[1:]))
+            self.stdout.write(f'{count} точек: {elapsed * 1000:.0f} мс, маршрут {length:.1f} км')
@@ -0,0 +1,39 @@
+import csv
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models import AddressLocation, normalize_address
+
+
+class Command(BaseCommand):
+    help = 'Импорт координат адресов из CSV (address, latitude, longitude) для планирования маршрутов.'
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument('path')
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options) -> None:
+        locations: dict[str, AddressLocation] = {}
+        try:
+            with open(options['path'], newline='', encoding='utf-8') as source:
+                for row in csv.DictReader(source):
+                    address = (row.get('address') or '').strip()
+                    if not address:
+                        continue
+                    key = normalize_address(address)
+                    locations[key] = AddressLocation(
+                        address=address,
+                        key=key,
+                        latitude=float(row['latitude']),
+                        longitude=float(row['longitude']),
+                    )
+        except (OSError, KeyError, ValueError) as error:
+            raise CommandError(f'Не удалось прочитать {options["path"]}: {error}') from error
+        AddressLocation.objects.bulk_create(
+            locations.values(),
+            batch_size=options['batch_size'],
+            update_conflicts=True,
+            unique_fields=['key'],
+            update_fields=['address', 'latitude', 'longitude'],
+        )
+        self.stdout.write(self.style.SUCCESS(f'Импортировано адресов: {len(locations)}'))
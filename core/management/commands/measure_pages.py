@@ -0,0 +1,102 @@
+import gzip
+import time
+from datetime import timedelta
+from types import SimpleNamespace
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.core.management.base import BaseCommand
+from django.template.backends.django import DjangoTemplates
+from django.test import RequestFactory
+from django.utils import timezone
+
+from core.models import User
+from core.storage import brotli
+
+TEMPLATES = ('core/free_requests.html', 'core/delivery_requests.html', 'core/login.html')
+STYLESHEETS = ('core/styles.css',)
+SOURCE_LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+
+
+class Command(BaseCommand):
+    help = 'Замер времени рендеринга шаблонов и объёма статики без кеширования и с production-профилем.'
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument('--iterations', type=int, default=200)
+        parser.add_argument('--rows', type=int, default=50)
+        parser.add_argument('--visits', type=int, default=20)
+
+    def _engine(self, loaders: list) -> DjangoTemplates:
+        return DjangoTemplates({
+            'NAME': 'measure',
+            'DIRS': settings.TEMPLATES[0]['DIRS'],
+            'APP_DIRS': False,
+            'OPTIONS': {'loaders': loaders},
+        })
+
+    def _context(self, rows: int) -> dict:
+        request = RequestFactory().get('/requests/deliveries/')
+        request.user = User(username='owner', role=User.Roles.OWNER)
+        now = timezone.now()
+        requests = [
+            SimpleNamespace(
+                id=index,
+                client_id=index,
+                client_name=f'Клиент {index}',
+                phone='+7 900 000-00-00',
+                address=f'ул. Ленина, д. {index}',
+                scheduled_for=now + timedelta(hours=index),
+                manager=None,
+                courier=None,
+                status='В ожидании доставки',
+            )
+            for index in range(rows)
+        ]
+        return {
+            'request': request,
+            'user': request.user,
+            'csrf_token': 'x' * 64,
+            'requests': requests,
+            'type': 'delivery',
+            'filters': {},
+            'statuses': [],
+            'managers': [],
+        }
+
+    def handle(self, *args, **options) -> None:
+        iterations = options['iterations']
+        context = self._context(options['rows'])
+        engines = (
+            ('без кеша', self._engine(SOURCE_LOADERS)),
+            ('cached loader', self._engine([('django.template.loaders.cached.Loader', SOURCE_LOADERS)])),
+        )
+        self.stdout.write(f'Рендеринг, мс на страницу ({iterations} итераций):')
+        for name in TEMPLATES:
+            timings = []
+            html_bytes = 0
+            for _, engine in engines:
+                started = time.perf_counter()
+                for _ in range(iterations):
+                    html = engine.get_template(name).render(context)
+                timings.append((time.perf_counter() - started) * 1000 / iterations)
+                html_bytes = len(html.encode())
+            self.stdout.write(
+                f'  {name}: {timings[0]:.3f} -> {timings[1]:.3f} '
+                f'(x{timings[0] / timings[1]:.1f}), HTML {html_bytes} байт'
+            )
+
+        visits = options['visits']
+        self.stdout.write(f'Статика, байт на {visits} визитов:')
+        for name in STYLESHEETS:
+            with open(finders.find(name), 'rb') as source:
+                content = source.read()
+            compressed = len(gzip.compress(content, compresslevel=9, mtime=0))
+            if brotli is not None:
+                compressed = min(compressed, len(brotli.compress(content, quality=11)))
+            self.stdout.write(
+                f'  {name}: {len(content) * visits} -> {compressed} '
+                f'(первый визит {len(content)} -> {compressed}, повторные 0 из-за immutable)'
+            )
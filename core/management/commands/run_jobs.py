@@ -0,0 +1,47 @@
+import os
+import socket
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, close_old_connections
+from django.utils.module_loading import autodiscover_modules
+
+from core import jobs
+
+MAX_BACKOFF_SECONDS = 30.0
+
+
+class Command(BaseCommand):
+    help = 'Воркер фоновой очереди задач.'
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument('--queue', default=jobs.DEFAULT_QUEUE)
+        parser.add_argument('--batch-size', type=int, default=100)
+        parser.add_argument('--lease', type=int, default=int(jobs.DEFAULT_LEASE.total_seconds()))
+        parser.add_argument('--poll', type=float, default=1.0)
+        parser.add_argument('--once', action='store_true', help='Обработать очередь и завершиться.')
+
+    def handle(self, *args, **options) -> None:
+        autodiscover_modules('tasks')
+        worker = f'{socket.gethostname()}:{os.getpid()}'
+        lease = timedelta(seconds=options['lease'])
+        backoff = options['poll']
+        while True:
+            try:
+                claimed = jobs.claim(worker, options['queue'], options['batch_size'], lease)
+                if claimed:
+                    done, failed = jobs.process(claimed)
+                    self.stdout.write(f'Выполнено: {done}, с ошибкой: {failed}')
+            except OperationalError as error:
+                self.stderr.write(f'Ошибка базы данных, повтор через {backoff:.1f} с: {error}')
+                close_old_connections()
+                time.sleep(backoff)
+                backoff = min(backoff * 2, MAX_BACKOFF_SECONDS)
+                continue
+            backoff = options['poll']
+            if claimed:
+                continue
+            if options['once']:
+                break
+            time.sleep(options['poll'])
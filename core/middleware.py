@@ -0,0 +1,109 @@
+import mimetypes
+import re
+from dataclasses import dataclass
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import FileResponse, HttpRequest, HttpResponse, HttpResponseNotModified
+from django.utils.http import http_date, parse_etags
+
+HASHED_NAME = re.compile(r'\.[0-9a-f]{12}\.[^/.]+$')
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+
+def _accepted_encodings(header: str) -> dict[str, float]:
+    # Codings with q=0 are refused (RFC 9110 12.5.3); an unparsable q counts as 0.
+    accepted = {}
+    for token in header.split(','):
+        coding, *params = (part.strip() for part in token.split(';'))
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[coding.lower()] = quality
+    return accepted
+
+
+@dataclass(frozen=True)
+class StaticAsset:
+    path: Path
+    content_type: str
+    etag: str
+    last_modified: str
+    immutable: bool
+    encoded: dict[str, Path]
+
+
+class StaticAssetMiddleware:
+    def __init__(self, get_response) -> None:
+        self.get_response = get_response
+        root = Path(settings.STATIC_ROOT) if settings.STATIC_ROOT else None
+        if root is None or not root.is_dir():
+            raise MiddlewareNotUsed
+        self.prefix = settings.STATIC_URL
+        self.max_age = settings.STATIC_MAX_AGE
+        self.assets = self._scan(root)
+
+    def _scan(self, root: Path) -> dict[str, StaticAsset]:
+        assets = {}
+        for path in root.rglob('*'):
+            if not path.is_file() or path.suffix in ('.gz', '.br'):
+                continue
+            stat = path.stat()
+            content_type, _ = mimetypes.guess_type(path.name)
+            name = path.relative_to(root).as_posix()
+            assets[name] = StaticAsset(
+                path=path,
+                content_type=content_type or 'application/octet-stream',
+                etag=f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"',
+                last_modified=http_date(stat.st_mtime),
+                immutable=bool(HASHED_NAME.search(name)),
+                encoded={
+                    encoding: path.with_name(path.name + suffix)
+                    for encoding, suffix in ENCODINGS
+                    if path.with_name(path.name + suffix).is_file()
+                },
+            )
+        return assets
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        if request.method in ('GET', 'HEAD') and request.path_info.startswith(self.prefix):
+            asset = self.assets.get(request.path_info[len(self.prefix):])
+            if asset is not None:
+                return self._serve(request, asset)
+        return self.get_response(request)
+
+    def _serve(self, request: HttpRequest, asset: StaticAsset) -> HttpResponse:
+        accepted = _accepted_encodings(request.headers.get('Accept-Encoding', ''))
+        path, encoding, best = asset.path, None, 0.0
+        for candidate, encoded_path in asset.encoded.items():
+            quality = accepted.get(candidate, accepted.get('*', 0.0))
+            if quality > best:
+                path, encoding, best = encoded_path, candidate, quality
+        etag = f'{asset.etag[:-1]}-{encoding}"' if encoding else asset.etag
+        # Weak comparison (RFC 9110 13.1.2): the W/ prefix is ignored when matching.
+        if_none_match = {tag.removeprefix('W/') for tag in parse_etags(request.headers.get('If-None-Match', ''))}
+        if etag in if_none_match or '*' in if_none_match:
+            response = HttpResponseNotModified()
+        else:
+            response = FileResponse(
+                path.open('rb'), content_type=asset.content_type, filename=asset.path.name
+            )
+            if encoding:
+                response.headers['Content-Encoding'] = encoding
+            response.headers['Last-Modified'] = asset.last_modified
+        response.headers['ETag'] = etag
+        if asset.encoded:
+            response.headers['Vary'] = 'Accept-Encoding'
+        if asset.immutable:
+            response.headers['Cache-Control'] = f'public, max-age={self.max_age}, immutable'
+        else:
+            response.headers['Cache-Control'] = 'public, max-age=60'
+        return response
@@ -0,0 +1,83 @@
+# Generated by Django on 2026-10-19
+
+import re
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+BACKFILL_BATCH_SIZE = 1000
+
+
+def normalize_phone(value):
+    digits = re.sub(r'\D+', '', value)
+    if len(digits) == 10:
+        return f'7{digits}'
+    if len(digits) == 11 and digits[0] == '8':
+        return f'7{digits[1:]}'
+    return digits
+
+
+def link_clients(apps, schema_editor):
+    Client = apps.get_model('core', 'Client')
+    for model_name in ('InstallationRequest', 'DeliveryRequest'):
+        model = apps.get_model('core', model_name)
+        last_pk = 0
+        while True:
+            batch = list(
+                model.objects.filter(pk__gt=last_pk, client__isnull=True)
+                .order_by('pk')
+                .only('pk', 'client_name', 'phone', 'address')[:BACKFILL_BATCH_SIZE]
+            )
+            if not batch:
+                break
+            last_pk = batch[-1].pk
+            keyed = [(normalize_phone(item.phone), item) for item in batch]
+            keyed = [(key, item) for key, item in keyed if key]
+            new_clients = {}
+            for key, item in keyed:
+                new_clients.setdefault(
+                    key,
+                    Client(name=item.client_name, phone=item.phone, phone_key=key, address=item.address),
+                )
+            Client.objects.bulk_create(new_clients.values(), ignore_conflicts=True)
+            client_ids = dict(
+                Client.objects.filter(phone_key__in=new_clients.keys()).values_list('phone_key', 'pk')
+            )
+            for key, item in keyed:
+                item.client_id = client_ids[key]
+            model.objects.bulk_update([item for _, item in keyed], ['client'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_addresslocation'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Client',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255)),
+                ('phone', models.CharField(max_length=30)),
+                ('phone_key', models.CharField(editable=False, max_length=30, unique=True)),
+                ('address', models.CharField(blank=True, max_length=255)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['name'],
+            },
+        ),
+        migrations.AddField(
+            model_name='deliveryrequest',
+            name='client',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='core.client'),
+        ),
+        migrations.AddField(
+            model_name='installationrequest',
+            name='client',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='core.client'),
+        ),
+        migrations.RunPython(link_clients, migrations.RunPython.noop),
+    ]
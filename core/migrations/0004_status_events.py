@@ -0,0 +1,76 @@
+# Generated by Django on 2026-10-19
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+BACKFILL_BATCH_SIZE = 1000
+
+
+def record_current_statuses(apps, schema_editor):
+    StatusCode = apps.get_model('core', 'StatusCode')
+    StatusEvent = apps.get_model('core', 'StatusEvent')
+    for kind, model_name in ((1, 'InstallationRequest'), (2, 'DeliveryRequest')):
+        model = apps.get_model('core', model_name)
+        statuses = set(model.objects.order_by().values_list('status', flat=True).distinct())
+        StatusCode.objects.bulk_create([StatusCode(name=name) for name in statuses], ignore_conflicts=True)
+        codes = dict(StatusCode.objects.filter(name__in=statuses).values_list('name', 'pk'))
+        last_pk = 0
+        while True:
+            batch = list(
+                model.objects.filter(pk__gt=last_pk)
+                .order_by('pk')
+                .values_list('pk', 'status', 'created_at')[:BACKFILL_BATCH_SIZE]
+            )
+            if not batch:
+                break
+            last_pk = batch[-1][0]
+            StatusEvent.objects.bulk_create(
+                StatusEvent(kind=kind, request_id=pk, to_status=codes[status], created_at=created_at)
+                for pk, status, created_at in batch
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_client'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StatusCode',
+            fields=[
+                ('id', models.SmallAutoField(primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=50, unique=True)),
+            ],
+            options={
+                'ordering': ['id'],
+            },
+        ),
+        migrations.CreateModel(
+            name='StatusEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.PositiveSmallIntegerField(choices=[(1, 'Установка'), (2, 'Доставка')])),
+                ('request_id', models.BigIntegerField()),
+                ('from_status', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('to_status', models.PositiveSmallIntegerField()),
+                ('state_seconds', models.PositiveIntegerField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('actor', models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [
+                    models.Index(fields=['kind', 'request_id', 'created_at'], name='status_event_request_idx'),
+                    models.Index(
+                        fields=['kind', 'created_at', 'from_status', 'state_seconds', 'actor'],
+                        name='status_event_period_idx',
+                    ),
+                ],
+            },
+        ),
+        migrations.RunPython(record_current_statuses, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,24 @@
+import re
+
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.utils import timezone
+
+_ADDRESS_SEPARATORS = re.compile(r'[\W_]+')
+_NON_DIGITS = re.compile(r'\D+')
+
+
+def normalize_address(value: str) -> str:
+    return ' '.join(_ADDRESS_SEPARATORS.sub(' ', value.lower().replace('ё', 'е')).split())
+
+
+def normalize_phone(value: str) -> str:
+    digits = _NON_DIGITS.sub('', value)
+    if len(digits) == 10:
+        return f'7{digits}'
+    if len(digits) == 11 and digits[0] == '8':
+        return f'7{digits[1:]}'
+    return digits
 
 
 class User(AbstractUser):
@@ -24,7 +43,26 @@ class User(AbstractUser):
         return self.role == self.Roles.DELIVERY
 
 
+class Client(models.Model):
+    name = models.CharField(max_length=255)
+    phone = models.CharField(max_length=30)
+    phone_key = models.CharField(max_length=30, unique=True, editable=False)
+    address = models.CharField(max_length=255, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['name']
+
+    def __str__(self) -> str:
+        return f"{self.name} ({self.phone})"
+
+    def save(self, *args, **kwargs) -> None:
+        self.phone_key = normalize_phone(self.phone)
+        super().save(*args, **kwargs)
+
+
 class BaseRequest(models.Model):
+    client = models.ForeignKey(Client, on_delete=models.SET_NULL, null=True, blank=True)
     client_name = models.CharField(max_length=255)
     phone = models.CharField(max_length=30)
     address = models.CharField(max_length=255)
@@ -46,6 +84,21 @@ class BaseRequest(models.Model):
     def __str__(self) -> str:
         return f"{self.client_name} ({self.scheduled_for:%d.%m.%Y %H:%M})"
 
+    def save(self, *args, **kwargs) -> None:
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or {'phone', 'client'} & set(update_fields):
+            self.link_client()
+        super().save(*args, **kwargs)
+
+    def link_client(self) -> None:
+        phone_key = normalize_phone(self.phone)
+        if not phone_key or (self.client_id and self.client.phone_key == phone_key):
+            return
+        self.client, _ = Client.objects.get_or_create(
+            phone_key=phone_key,
+            defaults={'name': self.client_name, 'phone': self.phone, 'address': self.address},
+        )
+
 
 class InstallationRequest(BaseRequest):
     installer = models.ForeignKey(
@@ -69,3 +122,90 @@ class DeliveryRequest(BaseRequest):
         limit_choices_to={'role': User.Roles.DELIVERY},
     )
     status = models.CharField(max_length=50, default='В ожидании доставки')
+
+
+class AddressLocation(models.Model):
+    address = models.CharField(max_length=255)
+    key = models.CharField(max_length=255, unique=True, editable=False)
+    latitude = models.FloatField()
+    longitude = models.FloatField()
+
+    class Meta:
+        ordering = ['address']
+
+    def __str__(self) -> str:
+        return f"{self.address} ({self.latitude:.5f}, {self.longitude:.5f})"
+
+    def save(self, *args, **kwargs) -> None:
+        self.key = normalize_address(self.address)
+        super().save(*args, **kwargs)
+
+
+class StatusCode(models.Model):
+    id = models.SmallAutoField(primary_key=True)
+    name = models.CharField(max_length=50, unique=True)
+
+    class Meta:
+        ordering = ['id']
+
+    def __str__(self) -> str:
+        return self.name
+
+
+class StatusEvent(models.Model):
+    class Kind(models.IntegerChoices):
+        INSTALLATION = 1, 'Установка'
+        DELIVERY = 2, 'Доставка'
+
+    kind = models.PositiveSmallIntegerField(choices=Kind.choices)
+    request_id = models.BigIntegerField()
+    from_status = models.PositiveSmallIntegerField(null=True, blank=True)
+    to_status = models.PositiveSmallIntegerField()
+    state_seconds = models.PositiveIntegerField(null=True, blank=True)
+    actor = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+        db_index=False,
+    )
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['kind', 'request_id', 'created_at'], name='status_event_request_idx'),
+            models.Index(
+                fields=['kind', 'created_at', 'from_status', 'state_seconds', 'actor'],
+                name='status_event_period_idx',
+            ),
+        ]
+
+
+class Job(models.Model):
+    class Status(models.IntegerChoices):
+        PENDING = 0, 'В очереди'
+        RUNNING = 1, 'Выполняется'
+        DONE = 2, 'Выполнено'
+        FAILED = 3, 'Ошибка'
+
+    queue = models.CharField(max_length=50, default='default')
+    task = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.PositiveSmallIntegerField(choices=Status.choices, default=Status.PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=5)
+    run_at = models.DateTimeField(default=timezone.now)
+    locked_by = models.CharField(max_length=100, blank=True)
+    locked_until = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['queue', 'status', 'run_at'], name='job_claim_idx'),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.task} #{self.pk} ({self.get_status_display()})"
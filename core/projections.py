@@ -0,0 +1,70 @@
+from datetime import datetime
+from typing import NamedTuple
+
+from django.db.models import QuerySet
+
+from core.models import User
+
+
+class RequestRow(NamedTuple):
+    id: int
+    client_id: int | None
+    client_name: str
+    phone: str
+    address: str
+    scheduled_for: datetime
+    status: str
+    manager: str | None
+    assignee_id: int | None = None
+
+
+class FreeRequestRow(NamedTuple):
+    id: int
+    client_name: str
+    phone: str
+    address: str
+    scheduled_for: datetime
+
+
+class ClientHistoryRow(NamedTuple):
+    scheduled_for: datetime
+    address: str
+    status: str
+    assignee: str | None
+
+
+REQUEST_ROW_COLUMNS = (
+    'id',
+    'client_id',
+    'client_name',
+    'phone',
+    'address',
+    'scheduled_for',
+    'status',
+    'manager__username',
+)
+
+
+def request_rows(qs: QuerySet, user: User, assignee_field: str) -> list[RequestRow]:
+    # Only installers and couriers get the claim column, so only they need the assignee.
+    columns = REQUEST_ROW_COLUMNS
+    if user.is_installer() or user.is_delivery():
+        columns += (f'{assignee_field}_id',)
+    return [RequestRow(*values) for values in qs.values_list(*columns)]
+
+
+def free_request_rows(qs: QuerySet) -> list[FreeRequestRow]:
+    return [FreeRequestRow(*values) for values in qs.values_list(*FreeRequestRow._fields)]
+
+
+def client_history_rows(qs: QuerySet, assignee_field: str) -> list[ClientHistoryRow]:
+    columns = ('scheduled_for', 'address', 'status', f'{assignee_field}__username')
+    return [ClientHistoryRow(*values) for values in qs.values_list(*columns)]
+
+
+def manager_choices() -> QuerySet:
+    return (
+        User.objects.filter(role=User.Roles.MANAGER)
+        .only('id', 'username', 'first_name', 'last_name')
+        .order_by('first_name', 'last_name', 'username')
+    )
@@ -0,0 +1,180 @@
+import math
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta
+from typing import Iterable, Sequence
+
+from django.conf import settings
+from django.utils import timezone
+
+from core.models import AddressLocation, DeliveryRequest, User, normalize_address
+
+EARTH_RADIUS_KM = 6371.0
+MAX_TWO_OPT_PASSES = 50
+
+Point = tuple[float, float]
+
+
+@dataclass(frozen=True)
+class RouteStop:
+    request: DeliveryRequest
+    position: int
+    point: Point | None
+    leg_km: float | None
+
+
+@dataclass
+class Route:
+    day: date
+    stops: list[RouteStop] = field(default_factory=list)
+
+    @property
+    def total_km(self) -> float:
+        return round(sum(stop.leg_km or 0.0 for stop in self.stops), 2)
+
+    @property
+    def unlocated(self) -> list[RouteStop]:
+        return [stop for stop in self.stops if stop.point is None]
+
+    def as_dict(self) -> dict:
+        return {
+            'date': self.day.isoformat(),
+            'total_km': self.total_km,
+            'stops': [
+                {
+                    'position': stop.position,
+                    'id': stop.request.pk,
+                    'client_name': stop.request.client_name,
+                    'phone': stop.request.phone,
+                    'address': stop.request.address,
+                    'scheduled_for': timezone.localtime(stop.request.scheduled_for).isoformat(),
+                    'status': stop.request.status,
+                    'latitude': stop.point[0] if stop.point else None,
+                    'longitude': stop.point[1] if stop.point else None,
+                    'leg_km': stop.leg_km,
+                }
+                for stop in self.stops
+            ],
+        }
+
+
+def haversine_km(a: Point, b: Point) -> float:
+    lat1, lon1 = math.radians(a[0]), math.radians(a[1])
+    lat2, lon2 = math.radians(b[0]), math.radians(b[1])
+    h = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(h))
+
+
+def _distance_matrix(points: Sequence[Point]) -> list[list[float]]:
+    size = len(points)
+    matrix = [[0.0] * size for _ in range(size)]
+    for i in range(size):
+        row = matrix[i]
+        for j in range(i + 1, size):
+            row[j] = matrix[j][i] = haversine_km(points[i], points[j])
+    return matrix
+
+
+def _nearest_neighbour(dist: list[list[float]], start: int) -> list[int]:
+    remaining = set(range(len(dist)))
+    remaining.discard(start)
+    order = [start]
+    current = start
+    while remaining:
+        row = dist[current]
+        current = min(remaining, key=row.__getitem__)
+        remaining.remove(current)
+        order.append(current)
+    return order
+
+
+def _two_opt(order: list[int], dist: list[list[float]], fixed_start: bool) -> list[int]:
+    # Open path: the last stop has no successor, and without a fixed origin
+    # the first stop has no predecessor either.
+    size = len(order)
+    first = 1 if fixed_start else 0
+    for _ in range(MAX_TWO_OPT_PASSES):
+        improved = False
+        for i in range(first, size - 1):
+            prev = order[i - 1] if i > 0 else None
+            for j in range(i + 1, size):
+                head = order[i]
+                tail = order[j]
+                after = order[j + 1] if j + 1 < size else None
+                before_cost = after_cost = 0.0
+                if prev is not None:
+                    before_cost += dist[prev][head]
+                    after_cost += dist[prev][tail]
+                if after is not None:
+                    before_cost += dist[tail][after]
+                    after_cost += dist[head][after]
+                if after_cost < before_cost - 1e-9:
+                    order[i:j + 1] = order[i:j + 1][::-1]
+                    improved = True
+        if not improved:
+            break
+    return order
+
+
+def order_points(points: Sequence[Point], origin: Point | None = None) -> list[int]:
+    if len(points) < 2:
+        return list(range(len(points)))
+    if origin is None:
+        dist = _distance_matrix(points)
+        order = _nearest_neighbour(dist, 0)
+        return _two_opt(order, dist, fixed_start=False)
+    dist = _distance_matrix([origin, *points])
+    order = _two_opt(_nearest_neighbour(dist, 0), dist, fixed_start=True)
+    return [index - 1 for index in order[1:]]
+
+
+def _window_index(moment: datetime, window: timedelta) -> int:
+    local = timezone.localtime(moment)
+    midnight = datetime.combine(local.date(), time.min, tzinfo=local.tzinfo)
+    return int((local - midnight) // window)
+
+
+def plan_route(
+    requests: Iterable[DeliveryRequest],
+    locations: dict[str, Point],
+    day: date,
+    origin: Point | None = None,
+    window: timedelta | None = None,
+) -> Route:
+    if window is None:
+        window = timedelta(minutes=settings.DELIVERY_ROUTE_WINDOW_MINUTES)
+    windows: dict[int, list[DeliveryRequest]] = {}
+    for delivery_request in sorted(requests, key=lambda item: (item.scheduled_for, item.pk)):
+        windows.setdefault(_window_index(delivery_request.scheduled_for, window), []).append(delivery_request)
+    route = Route(day=day)
+    current = origin
+    for index in sorted(windows):
+        located = []
+        unlocated = []
+        for delivery_request in windows[index]:
+            point = locations.get(normalize_address(delivery_request.address))
+            if point is None:
+                unlocated.append(delivery_request)
+            else:
+                located.append((delivery_request, point))
+        order = order_points([point for _, point in located], current)
+        for position in order:
+            delivery_request, point = located[position]
+            leg_km = round(haversine_km(current, point), 2) if current else None
+            route.stops.append(RouteStop(delivery_request, len(route.stops) + 1, point, leg_km))
+            current = point
+        for delivery_request in unlocated:
+            route.stops.append(RouteStop(delivery_request, len(route.stops) + 1, None, None))
+    return route
+
+
+def load_locations(addresses: Iterable[str]) -> dict[str, Point]:
+    keys = {normalize_address(address) for address in addresses}
+    rows = AddressLocation.objects.filter(key__in=keys).values_list('key', 'latitude', 'longitude')
+    return {key: (latitude, longitude) for key, latitude, longitude in rows}
+
+
+def build_courier_route(courier: User, day: date) -> Route:
+    requests = list(DeliveryRequest.objects.filter(courier=courier, scheduled_for__date=day))
+    locations = load_locations(delivery_request.address for delivery_request in requests)
+    depot = settings.DELIVERY_ROUTE_DEPOT
+    return plan_route(requests, locations, day, origin=tuple(depot) if depot else None)
@@ -0,0 +1,155 @@
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from datetime import datetime
+
+from django.db import transaction
+from django.db.models import Avg, Count, Max
+from django.utils import timezone
+
+from core.models import BaseRequest, InstallationRequest, StatusCode, StatusEvent, User
+
+DEFAULT_BATCH_SIZE = 500
+
+# name <-> code cache, filled only with rows known to be committed.
+_codes: dict[str, int] = {}
+_names: dict[int, str] = {}
+
+
+def _remember(codes: dict[str, int]) -> None:
+    _codes.update(codes)
+    _names.update({code: name for name, code in codes.items()})
+
+
+def _kind_for(instance: BaseRequest) -> int:
+    if isinstance(instance, InstallationRequest):
+        return StatusEvent.Kind.INSTALLATION
+    return StatusEvent.Kind.DELIVERY
+
+
+def resolve_codes(names: Iterable[str]) -> dict[str, int]:
+    names = set(names)
+    missing = names - _codes.keys()
+    found: dict[str, int] = {}
+    if missing:
+        StatusCode.objects.bulk_create([StatusCode(name=name) for name in missing], ignore_conflicts=True)
+        found = dict(StatusCode.objects.filter(name__in=missing).values_list('name', 'pk'))
+        transaction.on_commit(lambda: _remember(found))
+    return {name: _codes.get(name) or found[name] for name in names}
+
+
+def status_names(codes: Iterable[int]) -> dict[int, str]:
+    codes = set(codes)
+    missing = codes - _names.keys()
+    if missing:
+        _remember(dict(StatusCode.objects.filter(pk__in=missing).values_list('name', 'pk')))
+    return {code: _names[code] for code in codes if code in _names}
+
+
+def _last_events(kind: int, request_ids: set[int]) -> dict[int, tuple[int, datetime]]:
+    rows = (
+        StatusEvent.objects.filter(kind=kind, request_id__in=request_ids)
+        .order_by('request_id', 'created_at')
+        .values_list('request_id', 'to_status', 'created_at')
+    )
+    return {request_id: (status, created_at) for request_id, status, created_at in rows}
+
+
+class StatusEventWriter:
+    def __init__(self, batch_size: int = DEFAULT_BATCH_SIZE) -> None:
+        self.batch_size = batch_size
+        self._pending: list[tuple[int, int, str, int | None, datetime]] = []
+
+    def __enter__(self) -> 'StatusEventWriter':
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        if exc_type is None:
+            self.flush()
+        else:
+            self._pending.clear()
+
+    def record(self, instance: BaseRequest, actor: User | None = None, at: datetime | None = None) -> None:
+        actor_id = actor.pk if actor else None
+        self._pending.append((_kind_for(instance), instance.pk, instance.status, actor_id, at or timezone.now()))
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+        codes = resolve_codes(status for _, _, status, _, _ in pending)
+        last: dict[tuple[int, int], tuple[int, datetime]] = {}
+        for kind in {item[0] for item in pending}:
+            request_ids = {request_id for item_kind, request_id, _, _, _ in pending if item_kind == kind}
+            last.update(
+                ((kind, request_id), event) for request_id, event in _last_events(kind, request_ids).items()
+            )
+        events = []
+        for kind, request_id, status, actor_id, at in pending:
+            code = codes[status]
+            previous = last.get((kind, request_id))
+            if previous and previous[0] == code:
+                continue
+            events.append(StatusEvent(
+                kind=kind,
+                request_id=request_id,
+                from_status=previous[0] if previous else None,
+                to_status=code,
+                state_seconds=max(int((at - previous[1]).total_seconds()), 0) if previous else None,
+                actor_id=actor_id,
+                created_at=at,
+            ))
+            last[(kind, request_id)] = (code, at)
+        StatusEvent.objects.bulk_create(events, batch_size=self.batch_size)
+
+
+@contextmanager
+def status_events(batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[StatusEventWriter]:
+    with transaction.atomic(), StatusEventWriter(batch_size) as writer:
+        yield writer
+
+
+def request_history(instance: BaseRequest) -> list[dict]:
+    rows = list(
+        StatusEvent.objects.filter(kind=_kind_for(instance), request_id=instance.pk)
+        .order_by('created_at')
+        .values('from_status', 'to_status', 'state_seconds', 'actor_id', 'created_at')
+    )
+    names = status_names(row['to_status'] for row in rows)
+    for row in rows:
+        row['status'] = names.get(row['to_status'])
+    return rows
+
+
+def time_in_state(kind: int, since: datetime, until: datetime) -> list[dict]:
+    rows = list(
+        StatusEvent.objects.filter(
+            kind=kind,
+            from_status__isnull=False,
+            created_at__gte=since,
+            created_at__lt=until,
+        )
+        .values('from_status')
+        .annotate(transitions=Count('*'), avg_seconds=Avg('state_seconds'), max_seconds=Max('state_seconds'))
+        .order_by()
+    )
+    names = status_names(row['from_status'] for row in rows)
+    for row in rows:
+        row['status'] = names.get(row['from_status'])
+    return rows
+
+
+def worker_throughput(kind: int, since: datetime, until: datetime) -> list[dict]:
+    return list(
+        StatusEvent.objects.filter(
+            kind=kind,
+            from_status__isnull=False,
+            actor__isnull=False,
+            created_at__gte=since,
+            created_at__lt=until,
+        )
+        .values('actor_id')
+        .annotate(transitions=Count('*'))
+        .order_by('-transitions')
+    )
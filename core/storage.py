@@ -0,0 +1,40 @@
+import gzip
+from collections.abc import Iterator
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+
+try:
+    import brotli
+except ImportError:  # brotli is optional, gzip variants are always written
+    brotli = None
+
+COMPRESSIBLE_EXTENSIONS = ('.css', '.js', '.svg', '.json', '.txt', '.html', '.map', '.xml')
+MIN_COMPRESS_SIZE = 256
+
+
+def compress_variants(content: bytes) -> dict[str, bytes]:
+    variants = {'.gz': gzip.compress(content, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants['.br'] = brotli.compress(content, quality=11)
+    return {suffix: data for suffix, data in variants.items() if len(data) < len(content) * 0.95}
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    def post_process(self, paths, dry_run: bool = False, **options) -> Iterator[tuple]:
+        for name, hashed_name, processed in super().post_process(paths, dry_run, **options):
+            yield name, hashed_name, processed
+            if dry_run or isinstance(processed, Exception) or not hashed_name:
+                continue
+            for path in {name, hashed_name}:
+                self._write_compressed(path)
+
+    def _write_compressed(self, name: str) -> None:
+        if not name.endswith(COMPRESSIBLE_EXTENSIONS):
+            return
+        with open(self.path(name), 'rb') as source:
+            content = source.read()
+        if len(content) < MIN_COMPRESS_SIZE:
+            return
+        for suffix, data in compress_variants(content).items():
+            with open(self.path(name + suffix), 'wb') as target:
+                target.write(data)
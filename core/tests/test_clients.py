@@ -0,0 +1,44 @@
+from django.test import TestCase
+from django.utils import timezone
+
+from core.models import Client, DeliveryRequest, User
+
+
+class ClientLinkTests(TestCase):
+    def _create(self, phone: str) -> DeliveryRequest:
+        return DeliveryRequest.objects.create(
+            client_name='Иван', phone=phone, address='ул. Ленина, 1', scheduled_for=timezone.now()
+        )
+
+    def test_direct_create_links_client(self) -> None:
+        first = self._create('89123456789')
+        second = self._create('+7 (912) 345-67-89')
+        self.assertIsNotNone(first.client_id)
+        self.assertEqual(first.client_id, second.client_id)
+        self.assertEqual(Client.objects.get().phone_key, '79123456789')
+
+    def test_phone_change_relinks_client(self) -> None:
+        delivery_request = self._create('89123456789')
+        delivery_request.phone = '89000000000'
+        delivery_request.save()
+        self.assertEqual(delivery_request.client.phone_key, '79000000000')
+
+    def test_phone_search_finds_directly_created_request(self) -> None:
+        self._create('89123456789')
+        owner = User.objects.create_user('owner', password='pw', role=User.Roles.OWNER)
+        self.client.force_login(owner)
+        response = self.client.get('/requests/deliveries/', {'query': '89123456789'})
+        self.assertContains(response, 'ул. Ленина, 1')
+
+    def test_client_history_shows_assignees_without_per_row_queries(self) -> None:
+        courier = User.objects.create_user('courier', password='pw', role=User.Roles.DELIVERY)
+        for _ in range(5):
+            delivery_request = self._create('89123456789')
+            delivery_request.courier = courier
+            delivery_request.save()
+        owner = User.objects.create_user('owner', password='pw', role=User.Roles.OWNER)
+        self.client.force_login(owner)
+        url = f'/clients/{delivery_request.client_id}/'
+        with self.assertNumQueries(5):
+            response = self.client.get(url)
+        self.assertContains(response, 'courier', count=5)
@@ -0,0 +1,93 @@
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+
+from core import jobs
+from core.models import Job
+
+calls: list = []
+
+
+@jobs.task('test.ok')
+def ok(payload: dict) -> None:
+    calls.append(payload)
+
+
+@jobs.task('test.fail')
+def fail(payload: dict) -> None:
+    raise RuntimeError('boom')
+
+
+@jobs.task('test.batch', batched=True)
+def batch(payloads: list[dict]) -> None:
+    calls.append(payloads)
+
+
+class JobQueueTests(TestCase):
+    def setUp(self) -> None:
+        calls.clear()
+
+    def test_enqueue_inserts_on_commit(self) -> None:
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            jobs.enqueue('test.ok', {'a': 1})
+            self.assertFalse(Job.objects.exists())
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(Job.objects.get().payload, {'a': 1})
+
+    def test_successful_job_is_done(self) -> None:
+        Job.objects.create(task='test.ok', payload={'a': 1})
+        claimed = jobs.claim('w1')
+        self.assertEqual(claimed[0].status, Job.Status.RUNNING)
+        self.assertEqual(jobs.process(claimed), (1, 0))
+        job = Job.objects.get()
+        self.assertEqual((job.status, job.attempts, job.locked_by), (Job.Status.DONE, 1, ''))
+        self.assertEqual(calls, [{'a': 1}])
+
+    def test_failed_job_is_retried_with_backoff(self) -> None:
+        Job.objects.create(task='test.fail')
+        before = timezone.now()
+        self.assertEqual(jobs.process(jobs.claim('w1')), (0, 1))
+        job = Job.objects.get()
+        self.assertEqual((job.status, job.attempts), (Job.Status.PENDING, 1))
+        self.assertIn('boom', job.last_error)
+        self.assertGreaterEqual(job.run_at, before + timedelta(seconds=jobs.RETRY_BASE_SECONDS))
+        self.assertEqual(jobs.claim('w1'), [])
+
+    def test_job_fails_after_max_attempts(self) -> None:
+        Job.objects.create(task='test.fail', max_attempts=2)
+        for _ in range(2):
+            Job.objects.update(run_at=timezone.now())
+            jobs.process(jobs.claim('w1'))
+        job = Job.objects.get()
+        self.assertEqual((job.status, job.attempts), (Job.Status.FAILED, 2))
+        self.assertIsNotNone(job.finished_at)
+
+    def test_unknown_task_is_recorded_as_error(self) -> None:
+        Job.objects.create(task='test.missing')
+        self.assertEqual(jobs.process(jobs.claim('w1')), (0, 1))
+        self.assertEqual(Job.objects.get().last_error, 'Unknown task: test.missing')
+
+    def test_batched_handler_gets_all_payloads(self) -> None:
+        Job.objects.bulk_create([Job(task='test.batch', payload={'i': index}) for index in range(3)])
+        self.assertEqual(jobs.process(jobs.claim('w1')), (3, 0))
+        self.assertEqual(len(calls), 1)
+        self.assertCountEqual(calls[0], [{'i': 0}, {'i': 1}, {'i': 2}])
+
+    def test_expired_lease_is_reclaimed_and_stale_worker_cannot_finish(self) -> None:
+        Job.objects.create(task='test.ok')
+        stale = jobs.claim('w1', lease=timedelta(seconds=-1))
+        reclaimed = jobs.claim('w2')
+        self.assertEqual(len(reclaimed), 1)
+        self.assertEqual(reclaimed[0].attempts, 2)
+        self.assertEqual(jobs.process(stale), (0, 0))
+        job = Job.objects.get()
+        self.assertEqual((job.status, job.locked_by), (Job.Status.RUNNING, 'w2'))
+
+    def test_expired_lease_on_last_attempt_fails(self) -> None:
+        Job.objects.create(task='test.ok', max_attempts=1)
+        jobs.claim('w1', lease=timedelta(seconds=-1))
+        self.assertEqual(jobs.claim('w2'), [])
+        job = Job.objects.get()
+        self.assertEqual(job.status, Job.Status.FAILED)
+        self.assertEqual(job.last_error, 'Lease expired on the last attempt')
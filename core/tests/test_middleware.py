@@ -0,0 +1,61 @@
+import gzip
+import tempfile
+from pathlib import Path
+
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from core.middleware import StaticAssetMiddleware
+
+HASHED_NAME = 'core/styles.0123456789ab.css'
+
+
+class StaticAssetMiddlewareTests(SimpleTestCase):
+    def setUp(self) -> None:
+        self.root = tempfile.TemporaryDirectory()
+        self.addCleanup(self.root.cleanup)
+        path = Path(self.root.name) / HASHED_NAME
+        path.parent.mkdir(parents=True)
+        content = b'body { color: black; }\n' * 50
+        path.write_bytes(content)
+        path.with_name(path.name + '.gz').write_bytes(gzip.compress(content))
+        with override_settings(STATIC_ROOT=self.root.name):
+            self.middleware = StaticAssetMiddleware(lambda request: HttpResponse(status=404))
+        self.factory = RequestFactory()
+
+    def _get(self, **headers) -> HttpResponse:
+        response = self.middleware(self.factory.get(f'/static/{HASHED_NAME}', headers=headers))
+        self.addCleanup(response.close)
+        return response
+
+    def test_serves_encoded_variant_under_original_name(self) -> None:
+        response = self._get(accept_encoding='gzip, deflate')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        self.assertIn('immutable', response.headers['Cache-Control'])
+        self.assertIn('filename="styles.0123456789ab.css"', response.headers['Content-Disposition'])
+
+    def test_accept_encoding_quality_values(self) -> None:
+        for header, expected in (
+            ('gzip;q=0, identity', None),
+            ('*;q=0', None),
+            ('br, gzip;q=0', None),
+            ('*', 'gzip'),
+            ('identity, *;q=0.5', 'gzip'),
+            ('GZIP;q=0.8', 'gzip'),
+        ):
+            with self.subTest(header=header):
+                response = self._get(accept_encoding=header)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.headers.get('Content-Encoding'), expected)
+
+    def test_etag_list_and_weak_etag_return_304(self) -> None:
+        etag = self._get(accept_encoding='gzip').headers['ETag']
+        for header in (f'"other", {etag}', f'W/{etag}', '*'):
+            with self.subTest(header=header):
+                response = self._get(accept_encoding='gzip', if_none_match=header)
+                self.assertEqual(response.status_code, 304)
+
+    def test_etag_of_other_encoding_does_not_match(self) -> None:
+        etag = self._get().headers['ETag']
+        self.assertEqual(self._get(accept_encoding='gzip', if_none_match=etag).status_code, 200)
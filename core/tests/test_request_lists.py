@@ -0,0 +1,61 @@
+from django.test import TestCase
+from django.utils import timezone
+
+from core.models import DeliveryRequest, InstallationRequest, User
+
+
+class RequestListTests(TestCase):
+    def setUp(self) -> None:
+        self.manager = User.objects.create_user('manager_anna', password='pw', role=User.Roles.MANAGER)
+        self.installer = User.objects.create_user('installer', password='pw', role=User.Roles.INSTALLER)
+        self.courier = User.objects.create_user('courier', password='pw', role=User.Roles.DELIVERY)
+
+    def _create(self, model, address: str, **fields):
+        return model.objects.create(
+            client_name='Иван',
+            phone='89123456789',
+            address=address,
+            scheduled_for=timezone.now(),
+            manager=self.manager,
+            **fields,
+        )
+
+    def test_installer_can_claim_only_free_rows(self) -> None:
+        self._create(InstallationRequest, 'ул. Свободная, 1')
+        self._create(InstallationRequest, 'ул. Занятая, 2', installer=self.installer)
+        self.client.force_login(self.installer)
+        response = self.client.get('/requests/installations/')
+        self.assertContains(response, 'ул. Свободная, 1')
+        self.assertContains(response, 'ул. Занятая, 2')
+        self.assertContains(response, 'Взять заявку', count=1)
+        self.assertContains(response, 'Моя заявка', count=1)
+
+    def test_courier_can_claim_only_free_rows(self) -> None:
+        self._create(DeliveryRequest, 'ул. Свободная, 1')
+        self._create(DeliveryRequest, 'ул. Занятая, 2', courier=self.courier)
+        self.client.force_login(self.courier)
+        response = self.client.get('/requests/deliveries/')
+        self.assertContains(response, 'ул. Свободная, 1')
+        self.assertContains(response, 'ул. Занятая, 2')
+        self.assertContains(response, 'Взять заявку', count=1)
+        self.assertContains(response, 'Моя заявка', count=1)
+
+    def test_owner_list_shows_manager_username(self) -> None:
+        self._create(InstallationRequest, 'ул. Ленина, 1')
+        owner = User.objects.create_user('owner', password='pw', role=User.Roles.OWNER)
+        self.client.force_login(owner)
+        response = self.client.get('/requests/installations/')
+        self.assertContains(response, '<td>manager_anna</td>', html=True)
+        self.assertNotContains(response, 'Взять заявку')
+
+    def test_free_list_renders_only_unassigned_rows(self) -> None:
+        self._create(DeliveryRequest, 'ул. Свободная, 1')
+        self._create(DeliveryRequest, 'ул. Свободная, 3')
+        self._create(DeliveryRequest, 'ул. Занятая, 2', courier=self.courier)
+        self.client.force_login(self.courier)
+        response = self.client.get('/requests/deliveries/free/')
+        self.assertContains(response, 'ул. Свободная, 1')
+        self.assertContains(response, 'ул. Свободная, 3')
+        self.assertNotContains(response, 'ул. Занятая, 2')
+        self.assertContains(response, 'Взять доставку', count=2)
+        self.assertNotContains(response, 'Свободных заявок пока нет.')
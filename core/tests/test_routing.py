@@ -0,0 +1,89 @@
+import random
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from django.test import TestCase
+from django.utils import timezone
+
+from core.models import User
+from core.routing import haversine_km, order_points, plan_route
+
+
+def _stop(pk: int, address: str, scheduled_for: datetime) -> SimpleNamespace:
+    return SimpleNamespace(pk=pk, address=address, scheduled_for=scheduled_for)
+
+
+def _path_km(points, order, origin=None) -> float:
+    path = ([origin] if origin else []) + [points[index] for index in order]
+    return sum(haversine_km(a, b) for a, b in zip(path, path[1:]))
+
+
+class OrderPointsTests(TestCase):
+    def setUp(self) -> None:
+        rng = random.Random(7)
+        self.points = [(55.7 + rng.random() * 0.3, 37.5 + rng.random() * 0.4) for _ in range(60)]
+
+    def test_returns_permutation_without_origin(self) -> None:
+        self.assertEqual(sorted(order_points(self.points)), list(range(len(self.points))))
+
+    def test_returns_permutation_with_origin(self) -> None:
+        self.assertEqual(sorted(order_points(self.points, (55.75, 37.6))), list(range(len(self.points))))
+
+    def test_collinear_points_collapse_to_optimal_length(self) -> None:
+        line = [(55.0 + index * 0.01, 37.0) for index in range(30)]
+        shuffled = line[:]
+        random.Random(3).shuffle(shuffled)
+        order = order_points(shuffled)
+        self.assertAlmostEqual(_path_km(shuffled, order), haversine_km(line[0], line[-1]), places=6)
+
+    def test_few_hundred_stops_return_permutation(self) -> None:
+        rng = random.Random(11)
+        points = [(55.7 + rng.random() * 0.3, 37.5 + rng.random() * 0.4) for _ in range(500)]
+        self.assertEqual(sorted(order_points(points, (55.75, 37.6))), list(range(len(points))))
+
+
+class PlanRouteTests(TestCase):
+    def setUp(self) -> None:
+        self.day = timezone.localdate()
+        self.midnight = timezone.make_aware(datetime.combine(self.day, datetime.min.time()))
+
+    def test_earlier_windows_come_first(self) -> None:
+        # The late stop sits next to the origin but must still be visited last.
+        stops = [
+            _stop(1, 'близко', self.midnight + timedelta(hours=15)),
+            _stop(2, 'далеко', self.midnight + timedelta(hours=9)),
+        ]
+        locations = {'близко': (55.0, 37.0), 'далеко': (56.0, 38.0)}
+        route = plan_route(stops, locations, self.day, origin=(55.0, 37.0), window=timedelta(hours=2))
+        self.assertEqual([stop.request.pk for stop in route.stops], [2, 1])
+        self.assertEqual([stop.position for stop in route.stops], [1, 2])
+
+    def test_unlocated_stops_are_appended(self) -> None:
+        at = self.midnight + timedelta(hours=10)
+        stops = [_stop(1, 'нет в справочнике', at), _stop(2, 'a', at), _stop(3, 'b', at)]
+        locations = {'a': (55.0, 37.0), 'b': (55.1, 37.0)}
+        route = plan_route(stops, locations, self.day, window=timedelta(hours=2))
+        self.assertEqual(route.stops[-1].request.pk, 1)
+        self.assertIsNone(route.stops[-1].point)
+        self.assertEqual(len(route.unlocated), 1)
+
+
+class DeliveryRouteViewTests(TestCase):
+    def test_bad_date_returns_400(self) -> None:
+        courier = User.objects.create_user('courier', password='pw', role=User.Roles.DELIVERY)
+        self.client.force_login(courier)
+        response = self.client.get('/requests/deliveries/route/?date=bad')
+        self.assertEqual(response.status_code, 400)
+
+    def test_missing_courier_returns_400(self) -> None:
+        owner = User.objects.create_user('owner', password='pw', role=User.Roles.OWNER)
+        self.client.force_login(owner)
+        response = self.client.get('/requests/deliveries/route/')
+        self.assertEqual(response.status_code, 400)
+
+    def test_courier_gets_own_route(self) -> None:
+        courier = User.objects.create_user('courier', password='pw', role=User.Roles.DELIVERY)
+        self.client.force_login(courier)
+        response = self.client.get('/requests/deliveries/route/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['courier'], courier.pk)
@@ -0,0 +1,50 @@
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+
+from core.models import DeliveryRequest, StatusEvent, User
+from core.status_log import request_history, worker_throughput
+
+
+class StatusLogTests(TestCase):
+    def setUp(self) -> None:
+        self.manager = User.objects.create_user('manager', password='pw', role=User.Roles.MANAGER)
+        self.courier = User.objects.create_user('courier', password='pw', role=User.Roles.DELIVERY)
+
+    def _create_and_claim(self) -> DeliveryRequest:
+        self.client.force_login(self.manager)
+        self.client.post('/requests/deliveries/create/', {
+            'client_name': 'Иван',
+            'phone': '89123456789',
+            'address': 'ул. Ленина, 1',
+            'scheduled_for': '2030-01-01T10:00',
+        })
+        delivery_request = DeliveryRequest.objects.get()
+        self.client.force_login(self.courier)
+        self.client.post(f'/requests/deliveries/{delivery_request.pk}/claim/')
+        return delivery_request
+
+    def test_throughput_counts_transitions_not_creates(self) -> None:
+        self._create_and_claim()
+        now = timezone.now()
+        rows = worker_throughput(StatusEvent.Kind.DELIVERY, now - timedelta(hours=1), now + timedelta(hours=1))
+        self.assertEqual(rows, [{'actor_id': self.courier.pk, 'transitions': 1}])
+
+    def test_admin_status_edit_records_event(self) -> None:
+        delivery_request = self._create_and_claim()
+        admin = User.objects.create_superuser('admin', password='pw', role=User.Roles.OWNER)
+        self.client.force_login(admin)
+        response = self.client.get(f'/admin/core/deliveryrequest/{delivery_request.pk}/change/')
+        self.assertContains(response, 'Назначен доставщик')
+        self.client.post(f'/admin/core/deliveryrequest/{delivery_request.pk}/change/', {
+            'client_name': 'Иван',
+            'phone': '89123456789',
+            'address': 'ул. Ленина, 1',
+            'scheduled_for_0': '01.01.2030',
+            'scheduled_for_1': '10:00',
+            'courier': self.courier.pk,
+            'status': 'Доставлено',
+        })
+        statuses = [row['status'] for row in request_history(delivery_request)]
+        self.assertEqual(statuses, ['В ожидании доставки', 'Назначен доставщик', 'Доставлено'])
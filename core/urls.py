@@ -11,9 +11,11 @@ urlpatterns = [
     path('requests/deliveries/', views.delivery_requests, name='delivery_requests'),
     path('requests/installations/free/', views.free_installation_requests, name='free_installation_requests'),
     path('requests/deliveries/free/', views.free_delivery_requests, name='free_delivery_requests'),
+    path('requests/deliveries/route/', views.delivery_route, name='delivery_route'),
     path('requests/installations/<int:request_id>/claim/', views.claim_installation, name='claim_installation'),
     path('requests/deliveries/<int:request_id>/claim/', views.claim_delivery, name='claim_delivery'),
     path('requests/installations/create/', views.create_installation_request, name='create_installation_request'),
     path('requests/deliveries/create/', views.create_delivery_request, name='create_delivery_request'),
+    path('clients/<int:client_id>/', views.client_history, name='client_history'),
     path('section/<slug:section>/', views.placeholder_section, name='placeholder_section'),
 ]
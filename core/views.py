@@ -1,12 +1,15 @@
 from datetime import date, datetime, timedelta
 
 from django.contrib.auth.decorators import login_required
-from django.http import HttpRequest, HttpResponse
+from django.http import HttpRequest, HttpResponse, JsonResponse
 from django.db.models import Q
 from django.shortcuts import get_object_or_404, redirect, render
 from django.utils import timezone
 
-from core.models import DeliveryRequest, InstallationRequest, User
+from core.models import Client, DeliveryRequest, InstallationRequest, User, normalize_phone
+from core.projections import client_history_rows, free_request_rows, manager_choices, request_rows
+from core.routing import build_courier_route
+from core.status_log import status_events
 
 
 def _parse_datetime(value: str | None) -> datetime | None:
@@ -24,6 +27,13 @@ def _parse_date(value: str | None) -> date | None:
     return datetime.fromisoformat(value).date()
 
 
+def _search_filter(query: str) -> Q:
+    phone_key = normalize_phone(query)
+    if len(phone_key) >= 10 and not any(char.isalpha() for char in query):
+        return Q(client__phone_key=phone_key)
+    return Q(client_name__icontains=query) | Q(phone__icontains=query) | Q(address__icontains=query)
+
+
 @login_required
 def dashboard(request: HttpRequest) -> HttpResponse:
     user: User = request.user
@@ -54,7 +64,10 @@ def dashboard(request: HttpRequest) -> HttpResponse:
         my_deliveries = (
             DeliveryRequest.objects.filter(courier=user, scheduled_for__gte=now).order_by('scheduled_for')[:5]
         )
-        context.update({'my_deliveries': my_deliveries})
+        context.update({
+            'my_deliveries': my_deliveries,
+            'route': build_courier_route(user, timezone.localdate()),
+        })
         return render(request, 'core/dashboard_delivery.html', context)
     return render(request, 'core/dashboard_owner.html', context)
 
@@ -79,11 +92,7 @@ def installation_requests(request: HttpRequest) -> HttpResponse:
         'date_to': request.GET.get('date_to', '').strip(),
     }
     if filters['query']:
-        qs = qs.filter(
-            Q(client_name__icontains=filters['query'])
-            | Q(phone__icontains=filters['query'])
-            | Q(address__icontains=filters['query'])
-        )
+        qs = qs.filter(_search_filter(filters['query']))
     if filters['status']:
         qs = qs.filter(status=filters['status'])
     if filters['manager'] and user.is_owner():
@@ -101,9 +110,9 @@ def installation_requests(request: HttpRequest) -> HttpResponse:
     if date_to:
         qs = qs.filter(scheduled_for__date__lte=date_to)
     statuses = list(InstallationRequest.objects.order_by().values_list('status', flat=True).distinct())
-    managers = User.objects.filter(role=User.Roles.MANAGER).order_by('first_name', 'last_name', 'username')
+    managers = manager_choices()
     context = {
-        'requests': qs,
+        'requests': request_rows(qs, user, 'installer'),
         'filters': filters,
         'statuses': statuses,
         'managers': managers,
@@ -131,11 +140,7 @@ def delivery_requests(request: HttpRequest) -> HttpResponse:
         'date_to': request.GET.get('date_to', '').strip(),
     }
     if filters['query']:
-        qs = qs.filter(
-            Q(client_name__icontains=filters['query'])
-            | Q(phone__icontains=filters['query'])
-            | Q(address__icontains=filters['query'])
-        )
+        qs = qs.filter(_search_filter(filters['query']))
     if filters['status']:
         qs = qs.filter(status=filters['status'])
     if filters['manager'] and user.is_owner():
@@ -153,9 +158,9 @@ def delivery_requests(request: HttpRequest) -> HttpResponse:
     if date_to:
         qs = qs.filter(scheduled_for__date__lte=date_to)
     statuses = list(DeliveryRequest.objects.order_by().values_list('status', flat=True).distinct())
-    managers = User.objects.filter(role=User.Roles.MANAGER).order_by('first_name', 'last_name', 'username')
+    managers = manager_choices()
     context = {
-        'requests': qs,
+        'requests': request_rows(qs, user, 'courier'),
         'filters': filters,
         'statuses': statuses,
         'managers': managers,
@@ -163,13 +168,33 @@ def delivery_requests(request: HttpRequest) -> HttpResponse:
     return render(request, 'core/delivery_requests.html', context)
 
 
+@login_required
+def delivery_route(request: HttpRequest) -> HttpResponse:
+    user: User = request.user
+    if user.is_delivery():
+        courier = user
+    elif user.is_owner() or user.is_manager():
+        courier_id = request.GET.get('courier', '').strip()
+        if not courier_id.isdigit():
+            return JsonResponse({'error': 'courier is required'}, status=400)
+        courier = get_object_or_404(User, role=User.Roles.DELIVERY, pk=courier_id)
+    else:
+        return redirect('dashboard')
+    try:
+        day = _parse_date(request.GET.get('date', '').strip()) or timezone.localdate()
+    except ValueError:
+        return JsonResponse({'error': 'invalid date'}, status=400)
+    route = build_courier_route(courier, day)
+    return JsonResponse({'courier': courier.pk, **route.as_dict()})
+
+
 @login_required
 def free_installation_requests(request: HttpRequest) -> HttpResponse:
     user: User = request.user
     if not (user.is_installer() or user.is_owner()):
         return redirect('dashboard')
     qs = InstallationRequest.objects.filter(installer__isnull=True)
-    return render(request, 'core/free_requests.html', {'requests': qs, 'type': 'installation'})
+    return render(request, 'core/free_requests.html', {'requests': free_request_rows(qs), 'type': 'installation'})
 
 
 @login_required
@@ -178,7 +203,7 @@ def free_delivery_requests(request: HttpRequest) -> HttpResponse:
     if not (user.is_delivery() or user.is_owner()):
         return redirect('dashboard')
     qs = DeliveryRequest.objects.filter(courier__isnull=True)
-    return render(request, 'core/free_requests.html', {'requests': qs, 'type': 'delivery'})
+    return render(request, 'core/free_requests.html', {'requests': free_request_rows(qs), 'type': 'delivery'})
 
 
 @login_required
@@ -186,10 +211,14 @@ def claim_installation(request: HttpRequest, request_id: int) -> HttpResponse:
     user: User = request.user
     if not (user.is_installer() or user.is_owner()):
         return redirect('free_installation_requests')
-    installation_request = get_object_or_404(InstallationRequest, pk=request_id, installer__isnull=True)
-    installation_request.installer = user
-    installation_request.status = 'Назначен установщик'
-    installation_request.save()
+    with status_events() as log:
+        installation_request = get_object_or_404(
+            InstallationRequest.objects.select_for_update(), pk=request_id, installer__isnull=True
+        )
+        installation_request.installer = user
+        installation_request.status = 'Назначен установщик'
+        installation_request.save(update_fields=['installer', 'status'])
+        log.record(installation_request, actor=user)
     return redirect('installation_requests')
 
 
@@ -198,10 +227,14 @@ def claim_delivery(request: HttpRequest, request_id: int) -> HttpResponse:
     user: User = request.user
     if not (user.is_delivery() or user.is_owner()):
         return redirect('free_delivery_requests')
-    delivery_request = get_object_or_404(DeliveryRequest, pk=request_id, courier__isnull=True)
-    delivery_request.courier = user
-    delivery_request.status = 'Назначен доставщик'
-    delivery_request.save()
+    with status_events() as log:
+        delivery_request = get_object_or_404(
+            DeliveryRequest.objects.select_for_update(), pk=request_id, courier__isnull=True
+        )
+        delivery_request.courier = user
+        delivery_request.status = 'Назначен доставщик'
+        delivery_request.save(update_fields=['courier', 'status'])
+        log.record(delivery_request, actor=user)
     return redirect('delivery_requests')
 
 
@@ -224,14 +257,16 @@ def create_installation_request(request: HttpRequest) -> HttpResponse:
         manager_id = request.POST.get('manager')
         if manager_id:
             manager = User.objects.filter(role=User.Roles.MANAGER, pk=manager_id).first()
-    InstallationRequest.objects.create(
-        client_name=client_name,
-        phone=phone,
-        address=address,
-        scheduled_for=scheduled_for,
-        status=status,
-        manager=manager,
-    )
+    with status_events() as log:
+        installation_request = InstallationRequest.objects.create(
+            client_name=client_name,
+            phone=phone,
+            address=address,
+            scheduled_for=scheduled_for,
+            status=status,
+            manager=manager,
+        )
+        log.record(installation_request, actor=user)
     return redirect('installation_requests')
 
 
@@ -254,17 +289,38 @@ def create_delivery_request(request: HttpRequest) -> HttpResponse:
         manager_id = request.POST.get('manager')
         if manager_id:
             manager = User.objects.filter(role=User.Roles.MANAGER, pk=manager_id).first()
-    DeliveryRequest.objects.create(
-        client_name=client_name,
-        phone=phone,
-        address=address,
-        scheduled_for=scheduled_for,
-        status=status,
-        manager=manager,
-    )
+    with status_events() as log:
+        delivery_request = DeliveryRequest.objects.create(
+            client_name=client_name,
+            phone=phone,
+            address=address,
+            scheduled_for=scheduled_for,
+            status=status,
+            manager=manager,
+        )
+        log.record(delivery_request, actor=user)
     return redirect('delivery_requests')
 
 
+@login_required
+def client_history(request: HttpRequest, client_id: int) -> HttpResponse:
+    user: User = request.user
+    if not (user.is_owner() or user.is_manager()):
+        return redirect('dashboard')
+    client = get_object_or_404(Client, pk=client_id)
+    installations = InstallationRequest.objects.filter(client=client).order_by('-scheduled_for')
+    deliveries = DeliveryRequest.objects.filter(client=client).order_by('-scheduled_for')
+    if user.is_manager():
+        installations = installations.filter(manager=user)
+        deliveries = deliveries.filter(manager=user)
+    context = {
+        'client': client,
+        'installations': client_history_rows(installations, 'installer'),
+        'deliveries': client_history_rows(deliveries, 'courier'),
+    }
+    return render(request, 'core/client_history.html', context)
+
+
 @login_required
 def placeholder_section(request: HttpRequest, section: str) -> HttpResponse:
     user: User = request.user
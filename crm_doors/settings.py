@@ -79,7 +79,8 @@ USE_I18N = True
 USE_TZ = True
 
 STATIC_URL = '/static/'
-STATICFILES_DIRS = [BASE_DIR / 'core' / 'static']
+STATIC_ROOT = BASE_DIR / 'staticfiles'
+STATIC_MAX_AGE = 60 * 60 * 24 * 365
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
@@ -88,3 +89,6 @@ AUTH_USER_MODEL = 'core.User'
 LOGIN_URL = 'login'
 LOGIN_REDIRECT_URL = 'dashboard'
 LOGOUT_REDIRECT_URL = 'login'
+
+DELIVERY_ROUTE_DEPOT: tuple[float, float] | None = None
+DELIVERY_ROUTE_WINDOW_MINUTES = 120